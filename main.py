@@ -1,37 +1,215 @@
+import glob
+import math
+import os
+import pickle
+import zlib
+import numpy as np
 import pandas as pd
-import json
-import plotly.express as px
+import orjson  # Fast JSON parsing for the large GeoJSON files
+import simdjson  # SIMD JSON parser with on-demand field access
 import plotly.graph_objects as go
-import dash
-import pulp as pl  # Optimization library
 import dash_bootstrap_components as dbc  # For collapse components
-from dash import Dash, html, dcc, Input, Output, State
+from dash import Dash, html, dcc, Input, Output, State, Patch, no_update
+from flask_caching import Cache  # Memoizes the per-district callback output
 from pygments.styles.dracula import background
-from shapely.geometry import shape  # For computing centroids
-
-# === Load GeoJSON ===
+import shapely  # For simplifying the district polygons
+
+GEOJSON_PATH = "MP Districts Website Map final.geojson"
+EXCEL_PATH = "District data.xlsx"
+SIMPLIFY_TOLERANCE = 0.005  # Douglas-Peucker tolerance in degrees (~500 m)
+GEOJSON_CACHE_VERSION = 3  # Bump whenever the cached GeoJSON contents change
+
+# === Helpers for polygon centroids ===
+# All district geometries are (Multi)Polygons, so their centroids are computed
+# straight from the coordinate arrays with the shoelace formula.
+def ring_centroid(ring):
+    """Return (area, cx, cy) of a linear ring; the area is unsigned."""
+    xy = np.asarray(ring, dtype=float)
+    x, y = xy[:, 0], xy[:, 1]
+    x_next, y_next = np.roll(x, -1), np.roll(y, -1)
+    cross = x * y_next - x_next * y
+    area = cross.sum() / 2
+    if area == 0:
+        return 0.0, 0.0, 0.0  # Zero weight, so the centre does not matter
+    cx = ((x + x_next) * cross).sum() / (6 * area)
+    cy = ((y + y_next) * cross).sum() / (6 * area)
+    return abs(area), cx, cy
+
+def polygon_centroid(geometry):
+    """Area-weighted centroid (x, y) of a GeoJSON Polygon or MultiPolygon."""
+    if geometry["type"] == "Polygon":
+        polygons = [geometry["coordinates"]]
+    else:
+        polygons = geometry["coordinates"]
+    total = sum_x = sum_y = 0.0
+    for polygon in polygons:
+        for i, ring in enumerate(polygon):
+            area, cx, cy = ring_centroid(ring)
+            if i > 0:
+                area = -area  # Interior rings are holes
+            total += area
+            sum_x += area * cx
+            sum_y += area * cy
+    if total == 0:
+        # Degenerate geometry with no area: use the mean of its vertices
+        xy = np.concatenate([np.asarray(ring, dtype=float) for polygon in polygons for ring in polygon])
+        return xy[:, 0].mean(), xy[:, 1].mean()
+    return sum_x / total, sum_y / total
+
+# === Helper for writing cache files ===
+# The file is written under a temporary name in the same directory and then
+# moved into place, so a reader never sees a partially written cache. Caching is
+# only an optimisation: if the write fails (read-only checkout, full disk, ...)
+# the app carries on with the data it already has. After a successful write,
+# older cache files matching `stale_pattern` are removed.
+def write_cache_file(path, write, stale_pattern):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Ignoring failed cache write to {path}: {e}")
+        return
+    finally:
+        if os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    for old_path in glob.glob(stale_pattern):
+        if os.path.abspath(old_path) != os.path.abspath(path):
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+
+# === Load GeoJSON (cached on disk) ===
+# The parsed GeoJSON, district names and label centroids are static, so they are
+# pickled once and reloaded on later starts. The cache file name is keyed on the
+# source file's mtime and size (plus the simplify tolerance and a cache format
+# version), so editing the GeoJSON or the code that builds the cache invalidates it.
 try:
-    with open("MP Districts Website Map final.geojson", "r", encoding="utf-8") as f:
-        geojson_data = json.load(f)
+    geojson_stat = os.stat(GEOJSON_PATH)
 except Exception as e:
     raise FileNotFoundError(f"Error loading GeoJSON file: {e}")
+geojson_cache_path = (
+    f"cache_v{GEOJSON_CACHE_VERSION}_{geojson_stat.st_mtime_ns}_{geojson_stat.st_size}_{SIMPLIFY_TOLERANCE}.pkl"
+)
+
+geojson_cache = None
+if os.path.exists(geojson_cache_path):
+    try:
+        with open(geojson_cache_path, "rb") as f:
+            geojson_cache = pickle.load(f)
+    except Exception as e:
+        print(f"Ignoring unreadable GeoJSON cache, rebuilding it: {e}")
+
+if geojson_cache is not None:
+    geojson_data, district_names, lats, lons, labels = geojson_cache
+else:
+    geojson_parser = simdjson.Parser()
+    try:
+        with open(GEOJSON_PATH, "rb") as f:
+            geojson_doc = geojson_parser.parse(f.read())
+    except Exception as e:
+        raise FileNotFoundError(f"Error loading GeoJSON file: {e}")
+
+    # Read the district names straight off the parsed document so the coordinate
+    # arrays are not turned into Python objects just to list the names.
+    district_names = [f.at_pointer("/properties/Dist_Name") for f in geojson_doc["features"]]
+
+    # Plotly and shapely need a plain dict, so convert the document once.
+    geojson_data = geojson_doc.as_dict()
+
+    # --- Compute centroids for the permanent text labels ---
+    centroids = np.array([polygon_centroid(f["geometry"]) for f in geojson_data["features"]])
+    lons = centroids[:, 0]
+    lats = centroids[:, 1]
+    labels = list(district_names)
+
+    # Simplify the district polygons for display. The full-resolution shapes are
+    # only needed for the centroids above; Plotly and the browser get far fewer
+    # vertices to serialise, send and draw.
+    geoms = shapely.from_geojson([orjson.dumps(f["geometry"]) for f in geojson_data["features"]])
+    simplified = shapely.simplify(geoms, SIMPLIFY_TOLERANCE, preserve_topology=True)
+    for feature, geom_json in zip(geojson_data["features"], shapely.to_geojson(simplified)):
+        feature["geometry"] = orjson.loads(geom_json)
+
+    def dump_geojson_cache(path):
+        with open(path, "wb") as f:
+            pickle.dump((geojson_data, district_names, lats, lons, labels), f, protocol=5)
+
+    write_cache_file(geojson_cache_path, dump_geojson_cache, "cache_*.pkl")
 
 # === Load MP State Outline GeoJSON ===
 try:
-    with open("MP state outline.geojson", "r", encoding="utf-8") as f:
-        state_outline_geojson = json.load(f)
+    with open("MP state outline.geojson", "rb") as f:
+        state_outline_geojson = orjson.loads(f.read())
 except Exception as e:
     raise FileNotFoundError(f"Error loading MP State Outline GeoJSON file: {e}")
 
 districts_geo = geojson_data
-district_names = [f["properties"]["Dist_Name"] for f in geojson_data["features"]]
 print(district_names)
 
 # === Load Excel Data ===
+# Short names for the sheet columns the dashboard reads
+record_columns = {
+    "census_pop": "Sum of Census 2011 Population",
+    "pop_2025": "Sum of Projected Population by 2025",
+    "sw_gen": "Sum of SW_Generation (TPD)",
+    "sw_proc": "Sum of SW_Processed_ (TPD)",
+    "sw_gap": "Sum of SW Collection Gap (in TPD)",
+    "sewage_gen": "Sum of Sewage Generation (in MLD)",
+    "growth_rate": "Average of Decadal Grouth Rate in % (During 2001-2011)",
+    "pw": "Sum of Estimated PW Generation in TPD",
+    "cd": "Sum of C&D Waste Generation in TPD - 2025",
+    "ew_tpa": "Sum of e-waste Generation (TPA)",
+}
+
+# Only load the district name column (always the first column, whatever its
+# header) and the columns above, with their dtypes given up front instead of
+# inferred per cell.
+excel_columns = set(record_columns.values())
+excel_dtypes = {col: "float64" for col in record_columns.values()}
+
+# Parsing the XLSX is slow, so the loaded sheet is written to Parquet on the
+# first run and read from there afterwards. As with the GeoJSON cache, the file
+# name is keyed on the workbook's mtime and size, plus the selected columns.
 try:
-    df = pd.read_excel("District data.xlsx", sheet_name="Dist Wise Pivot  (2)", header=2)
+    excel_stat = os.stat(EXCEL_PATH)
 except Exception as e:
     raise FileNotFoundError(f"Error loading Excel file: {e}")
+excel_columns_key = zlib.crc32("|".join(sorted(excel_columns)).encode())
+excel_cache_path = f"cache_{excel_stat.st_mtime_ns}_{excel_stat.st_size}_{excel_columns_key}.parquet"
+
+df = None
+if os.path.exists(excel_cache_path):
+    try:
+        df = pd.read_parquet(excel_cache_path)
+    except Exception as e:
+        print(f"Ignoring unreadable Excel cache, rebuilding it: {e}")
+
+if df is None:
+    try:
+        # Read just the header row to find the positions of the needed columns
+        excel_header = pd.read_excel(EXCEL_PATH, sheet_name="Dist Wise Pivot  (2)", header=2, nrows=0).columns
+        excel_positions = [0] + [
+            i for i, col in enumerate(excel_header) if i > 0 and str(col).strip() in excel_columns
+        ]
+        df = pd.read_excel(
+            EXCEL_PATH,
+            sheet_name="Dist Wise Pivot  (2)",
+            header=2,
+            usecols=excel_positions,
+            dtype=excel_dtypes
+        )
+    except Exception as e:
+        raise FileNotFoundError(f"Error loading Excel file: {e}")
+    try:
+        write_cache_file(excel_cache_path, df.to_parquet, "cache_*.parquet")
+    except Exception as e:  # e.g. pyarrow failing to serialise a column
+        print(f"Ignoring failed cache write to {excel_cache_path}: {e}")
 
 df.columns = [str(col).strip() for col in df.columns]
 df = df.rename(columns={df.columns[0]: "District"})
@@ -40,6 +218,77 @@ df = df[df["District"].notna() & df["District"].str.strip().ne("")]
 def safe(val):
     return float(val) if pd.notna(val) else 0.0
 
+# --------------------------------------------------------
+# VEHICLE OPTIMIZATION MODEL
+# --------------------------------------------------------
+def solve_vehicles(W):
+    """Return the cheapest (bulk, LCV, tri-cycle) vehicle counts covering W tonnes/day."""
+    # Vehicle capacities (in tonnes)
+    cap_bulk = 20  # Bulk truck capacity
+    cap_lcv = 3.8  # Mini LCV capacity
+    cap_tri = 0.5  # Tri-cycle trolley capacity
+
+    # Cost parameters (per day cost for each vehicle; ADD YOUR VALUES HERE)
+    cost_bulk = 2354 # e.g., cost per day for one bulk truck [ADD YOUR COST]
+    cost_lcv = 1926 # e.g., cost per day for one mini LCV truck [ADD YOUR COST]
+    cost_tri = 913  # e.g., cost per day for one tri-cycle trolley [ADD YOUR COST]
+
+    # Minimise cost_bulk*x + cost_lcv*y + cost_tri*z subject to
+    # cap_bulk*x + cap_lcv*y + cap_tri*z >= W over non-negative integers.
+    # With only three vehicle types the search space is tiny: for each number of
+    # bulk trucks and LCVs, the cheapest completion is the fewest trolleys that
+    # cover the remainder. Enumerating it is exact and avoids spawning a solver.
+    best = (float("inf"), 0, 0, 0)
+    for x in range(int(W / cap_bulk) + 2):
+        rem1 = max(0.0, W - cap_bulk * x)
+        for y in range(int(rem1 / cap_lcv) + 2):
+            rem2 = max(0.0, rem1 - cap_lcv * y)
+            z = math.ceil(rem2 / cap_tri - 1e-9)  # Tolerate float round-off
+            cost = cost_bulk * x + cost_lcv * y + cost_tri * z
+            if cost < best[0]:
+                best = (cost, x, y, z)
+
+    # Retrieve the optimal number of vehicles
+    return best[1:]
+
+# The only varying input is the district's waste generation, which is static,
+# so solve the model once per district here instead of on every click.
+vehicle_opts = pd.DataFrame(
+    [solve_vehicles(w) for w in df["Sum of SW_Generation (TPD)"].apply(safe)],
+    index=df.index,
+    columns=["bulk_opt", "lcv_opt", "tri_opt"]
+)
+df = df.join(vehicle_opts)
+
+# === Per-district records ===
+# The data is static, so every value the callback needs is pulled out of the
+# DataFrame once, cleaned with safe(), and stored in a plain dict keyed by the
+# normalised district name. The callback then never touches pandas.
+forecast_years = list(range(2025, 2031))
+
+# Population Forecast Calculation (CAGR between Census 2011 and 2025), done for
+# all districts at once with NumPy broadcasting: one row per district, one
+# column per forecast year.
+census_pops = df["Sum of Census 2011 Population"].apply(safe).to_numpy()
+pops_2025 = df["Sum of Projected Population by 2025"].apply(safe).to_numpy()
+with np.errstate(divide="ignore", invalid="ignore"):
+    cagrs = np.where(census_pops > 0, (pops_2025 / census_pops) ** (1 / (2025 - 2011)) - 1, 0.0)
+df["CAGR"] = cagrs
+forecasts = pops_2025[:, None] * (1 + cagrs[:, None]) ** np.arange(len(forecast_years))
+
+district_records = {}
+for i, rec in enumerate(df.to_dict("records")):
+    key = str(rec["District"]).lower().strip()
+    if key in district_records:
+        continue  # Keep the first match
+    r = {alias: safe(rec.get(col)) for alias, col in record_columns.items()}
+    r["CAGR"] = float(cagrs[i])
+    r["forecast"] = forecasts[i].tolist()
+    r["bulk_opt"] = int(rec["bulk_opt"])
+    r["lcv_opt"] = int(rec["lcv_opt"])
+    r["tri_opt"] = int(rec["tri_opt"])
+    district_records[key] = r
+
 # === Helper for empty figures ===
 def empty_figure(title):
     fig = go.Figure()
@@ -51,25 +300,118 @@ def empty_figure(title):
     )
     return fig
 
+# === Helper for KPI cards ===
+# The card styles are shared module constants rather than fresh dicts per card.
+kpi_card_style = {"padding": "15px", "borderRadius": "10px", "color": "white", "textAlign": "center", "margin": "5px"}
+kpi_title_style = {"fontSize": "16px", "fontWeight": "normal", "margin": "0"}
+kpi_value_style = {"fontSize": "24px", "fontWeight": "bold", "margin": "0"}
+
+def kpi_card(title, value, bg="#2c2c2c", flex="1 1 22%", **style):
+    return html.Div(
+        [
+            html.H4(title, style=kpi_title_style),
+            html.P(value, style=kpi_value_style)
+        ],
+        style={**kpi_card_style, "backgroundColor": bg, "flex": flex, **style}
+    )
+
+# === Section figures ===
+# The charts are built once here and placed in the layout. Only the trace values
+# change between districts, so the callback sends them as Patch updates instead
+# of re-sending whole figures.
+pop_fig = go.Figure(
+    data=[
+        go.Scatter(
+            x=[str(year) for year in forecast_years],
+            y=[],
+            mode='lines+markers',
+            line=dict(color="red", width=3),
+            marker=dict(color="blue", size=15)
+        )
+    ],
+    layout=go.Layout(
+        title={
+            "text": "Population Forecast (2025-2030)",
+            "x": 0.5,
+            "font": {"size": 30, "color": "white", "family": "Arial"}
+        },
+        yaxis_title="Population",
+        xaxis=dict(
+            showgrid=True,
+            gridcolor="rgba(255,255,255,0.2)",
+            zerolinecolor="rgba(255,255,255,0.4)"
+        ),
+        yaxis=dict(
+            showgrid=True,
+            gridcolor="rgba(255,255,255,0.2)",
+            zerolinecolor="rgba(255,255,255,0.4)"
+        ),
+        plot_bgcolor="rgba(30,30,30,0.6)",
+        paper_bgcolor="rgba(30,30,30,0.8)",
+        font_color="white"
+    )
+)
+
+bar_fig = go.Figure(
+    data=[
+        go.Bar(name="Generated", x=["Generated"], y=[0], marker_color="blue"),
+        go.Bar(name="Processed", x=["Processed"], y=[0], marker_color="green"),
+        go.Bar(name="Gap", x=["Gap"], y=[0], marker_color="red")
+    ],
+    layout=go.Layout(
+        barmode="group",
+        title={"text": "Current Waste Metrics (TPD)", "x": 0.5},
+        plot_bgcolor="#1e1e1e",
+        paper_bgcolor="#1e1e1e",
+        font_color="white",
+        margin={"r": 0, "t": 40, "l": 0, "b": 0}
+    )
+)
+
+pie_fig = go.Figure(
+    data=[
+        go.Pie(
+            labels=["Processed", "Gap"],
+            values=[],
+            hole=0.3,
+            marker=dict(colors=["green", "red"])
+        )
+    ],
+    layout=go.Layout(
+        title={"text": "Processed vs Gap (TPD)", "x": 0.5},
+        plot_bgcolor="#1e1e1e",
+        paper_bgcolor="#1e1e1e",
+        font_color="white",
+        margin={"r": 0, "t": 40, "l": 0, "b": 0}
+    )
+)
+
+# Chart containers stay hidden until a district with data has been selected
+hidden_style = {"display": "none"}
+charts_row_style = {
+    "display": "flex",
+    "flexDirection": "row",
+    "justifyContent": "space-around",
+    "width": "100%"
+}
+
 # === Create Dash App with Bootstrap external stylesheet ===
 app = Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
 app.title = "MP Waste Dashboard"
 
-# Create choropleth map with color by waste generated
-map_fig = px.choropleth_map(
-    df,
+# In-process cache for the per-district dashboard sections (see build_sections)
+cache = Cache(app.server, config={"CACHE_TYPE": "SimpleCache"})
+
+# Create choropleth map of the districts. The trace is built directly with
+# go.Choroplethmap; every district gets the same flat fill colour.
+district_trace = go.Choroplethmap(
     geojson=districts_geo,
-    locations="District",
+    locations=df["District"],
+    z=[1] * len(df),
     featureidkey="properties.Dist_Name",
-    map_style="carto-positron",
-    color_continuous_scale="bluered",
-    range_color=(700, 700),
-    center={"lat": 24, "lon": 78.5},
-    zoom=6,
-    opacity=0.7
-)
-
-map_fig.update_traces(
+    colorscale=[[0, "#636efa"], [1, "#636efa"]],
+    showscale=False,
+    marker_opacity=0.7,
     marker_line_width=0.5,             # White border width
     marker_line_color="black",         # White border always
     hovertemplate="%{location}",
@@ -77,16 +419,7 @@ map_fig.update_traces(
     unselected=dict(marker=dict(opacity=0.3))  # Slightly faded when unselected
 )
 
-# --- Compute centroids and add permanent text labels ---
-lats = []
-lons = []
-labels = []
-for feature in geojson_data["features"]:
-    geom = shape(feature["geometry"])
-    centroid = geom.centroid
-    lats.append(centroid.y)
-    lons.append(centroid.x)
-    labels.append(feature["properties"]["Dist_Name"])
+# --- Add permanent text labels at the district centroids ---
 print(len(lats), len(lons), len(labels))
 
 text_trace = go.Scattermap(
@@ -100,10 +433,10 @@ text_trace = go.Scattermap(
     showlegend=False
 )
 
-new_data = [text_trace] + list(map_fig.data)
-map_fig = go.Figure(data=new_data, layout=map_fig.layout)
+map_fig = go.Figure(data=[text_trace, district_trace])
 
 map_fig.update_layout(
+    map=dict(style="carto-positron", center={"lat": 24, "lon": 78.5}, zoom=6),
     margin={"r": 0, "t": 0, "l": 0, "b": 0},
     clickmode="event+select",
     dragmode=False,
@@ -186,7 +519,15 @@ app.layout = dbc.Container(
         dbc.Row(
             [
                 dbc.Collapse(
-                    html.Div(id="pop-section-content"),
+                    html.Div([
+                        html.Div(id="pop-section-content"),  # Census KPI card
+                        html.Div(
+                            dcc.Graph(id="pop-forecast-graph", figure=pop_fig),
+                            id="pop-chart-container",
+                            style=hidden_style
+                        ),
+                        html.Div(id="pop-kpi-content")  # KPI cards for each forecast year
+                    ]),
                     id="collapse-pop",
                     is_open=False
                 )
@@ -196,7 +537,20 @@ app.layout = dbc.Container(
         dbc.Row(
             [
                 dbc.Collapse(
-                    html.Div(id="waste-char-section-content"),
+                    html.Div([
+                        html.Div(id="waste-char-section-content"),  # % Waste Processed card
+                        html.Div(
+                            [
+                                html.Div(dcc.Graph(id="waste-bar-graph", figure=bar_fig),
+                                         style={"flex": "1", "margin": "10px"}),
+                                html.Div(dcc.Graph(id="waste-pie-graph", figure=pie_fig),
+                                         style={"flex": "1", "margin": "10px"})
+                            ],
+                            id="waste-chart-container",
+                            style=hidden_style
+                        ),
+                        html.Div(id="vehicle-content")  # Vehicle requirement cards
+                    ], style={"marginTop": "20px"}),
                     id="collapse-waste-char",
                     is_open=False
                 )
@@ -219,37 +573,81 @@ app.layout = dbc.Container(
 )
 
 # --- Dashboard Update Callback ---
-# This callback updates the district card and the content for each of the three sections
+# This callback updates the district card and the content for each of the three
+# sections. The charts live in the layout and only receive Patch updates.
 @app.callback(
     [Output("district-card", "children"),
      Output("pop-section-content", "children"),
+     Output("pop-chart-container", "style"),
+     Output("pop-forecast-graph", "figure"),
+     Output("pop-kpi-content", "children"),
      Output("waste-char-section-content", "children"),
+     Output("waste-chart-container", "style"),
+     Output("waste-bar-graph", "figure"),
+     Output("waste-pie-graph", "figure"),
+     Output("vehicle-content", "children"),
      Output("waste-comp-section-content", "children")],
     Input("district-map", "clickData")
 )
 def update_dashboard(clickData):
     if not clickData or "points" not in clickData:
         # If no district has been clicked yet, show placeholder messages.
-        placeholder = html.Div("Click a district on the map", style={"color": "white", "textAlign": "center"})
-        return placeholder, placeholder, placeholder, placeholder
+        return message_outputs("Click a district on the map")
 
     district_name = clickData["points"][0]["location"]
-    match_row = df[df["District"].str.lower().str.strip() == district_name.lower().strip()]
-    if match_row.empty:
-        no_data = html.Div("No data for selected district", style={"color": "white", "textAlign": "center"})
-        return no_data, no_data, no_data, no_data
+    sections = build_sections(district_name)
+    if sections is None:
+        return message_outputs("No data for selected district")
+
+    # Partial figure updates: only the changed trace values are sent
+    pop_patch = Patch()
+    pop_patch["data"][0]["y"] = sections["pop_forecast_y"]
+
+    bar_patch = Patch()
+    for i, (name, value) in enumerate(sections["bars"]):
+        bar_patch["data"][i]["name"] = name
+        bar_patch["data"][i]["y"] = [value]
+
+    pie_patch = Patch()
+    pie_patch["data"][0]["values"] = sections["pie_values"]
+
+    return (
+        sections["district_card"],
+        sections["census_card"],
+        {},
+        pop_patch,
+        sections["population_kpi_cards"],
+        sections["waste_char_kpi_cards"],
+        charts_row_style,
+        bar_patch,
+        pie_patch,
+        sections["vehicle_content"],
+        sections["waste_comp_section"]
+    )
+
+def message_outputs(message):
+    """Callback outputs showing `message` in every section with the charts hidden."""
+    msg = html.Div(message, style={"color": "white", "textAlign": "center"})
+    return msg, msg, hidden_style, no_update, None, msg, hidden_style, no_update, no_update, None, msg
+
+# The district data is static, so the sections for a district only need to be
+# built once; repeat clicks are served from the cache.
+@cache.memoize(timeout=0)
+def build_sections(district_name):
+    r = district_records.get(district_name.lower().strip())
+    if r is None:
+        return None
 
-    row = match_row.iloc[0]
     # Extract values
-    census_pop = safe(row.get("Sum of Census 2011 Population", 0))
-    sw_gen = safe(row.get("Sum of SW_Generation (TPD)", 0))
-    sw_proc = safe(row.get("Sum of SW_Processed_ (TPD)", 0))
-    sw_gap = safe(row.get("Sum of SW Collection Gap (in TPD)", 0))
+    census_pop = r["census_pop"]
+    sw_gen = r["sw_gen"]
+    sw_proc = r["sw_proc"]
+    sw_gap = r["sw_gap"]
     processed_percent = (sw_proc / sw_gen * 100) if sw_gen > 0 else 0
     if processed_percent > 100:
         processed_percent = 100
-    sewage_gen = safe(row.get("Sum of Sewage Generation (in MLD)", 0))
-    growth_rate = safe(row.get("Average of Decadal Grouth Rate in % (During 2001-2011)"))
+    sewage_gen = r["sewage_gen"]
+    growth_rate = r["growth_rate"]
 
     # --------------------------
     # District Card (always visible)
@@ -278,66 +676,17 @@ def update_dashboard(clickData):
         }
     )
 
-    # Population Forecast Calculation (same as before)
-    pop_2025 = safe(row.get("Sum of Projected Population by 2025", 0))
-    if census_pop > 0:
-        CAGR = (pop_2025 / census_pop) ** (1 / (2025 - 2011)) - 1
-    else:
-        CAGR = 0
-    years = list(range(2025, 2031))
-    pop_forecast_values = [pop_2025 * ((1 + CAGR) ** (year - 2025)) for year in years]
+    # Population forecast is precomputed per district at startup
+    years = forecast_years
+    pop_forecast_values = r["forecast"]
 
-    # Population Forecast Line Chart
-    pop_forecast_fig = go.Figure()
-    pop_forecast_fig.add_trace(
-        go.Scatter(
-            x=[str(year) for year in years],
-            y=[round(val, 2) for val in pop_forecast_values],
-            mode='lines+markers',
-            line=dict(color="red", width=3),
-            marker=dict(color="blue", size=15)
-        )
-    )
-    pop_forecast_fig.update_layout(
-        title={
-            "text": "Population Forecast (2025-2030)",
-            "x": 0.5,
-            "font": {"size": 30, "color": "white", "family": "Arial"}
-        },
-        yaxis_title="Population",
-        xaxis=dict(
-            showgrid=True,
-            gridcolor="rgba(255,255,255,0.2)",
-            zerolinecolor="rgba(255,255,255,0.4)"
-        ),
-        yaxis=dict(
-            showgrid=True,
-            gridcolor="rgba(255,255,255,0.2)",
-            zerolinecolor="rgba(255,255,255,0.4)"
-        ),
-        plot_bgcolor="rgba(30,30,30,0.6)",
-        paper_bgcolor="rgba(30,30,30,0.8)",
-        font_color="white"
-    )
+    # Population Forecast Line Chart values
+    pop_forecast_y = [round(val, 2) for val in pop_forecast_values]
 
     # Create separate KPI cards for the forecasted population for each year
     population_kpi_cards = html.Div(
         [
-            html.Div(
-                [
-                    html.H4(str(year), style={"fontSize": "16px", "fontWeight": "normal", "margin": "0"}),
-                    html.P(f"{round(val):,}", style={"fontSize": "24px", "fontWeight": "bold", "margin": "0"})
-                ],
-                style={
-                    "padding": "15px",
-                    "borderRadius": "10px",
-                    "backgroundColor": "#2c2c2c",
-                    "color": "white",
-                    "textAlign": "center",
-                    "margin": "5px",
-                    "flex": "1 1 15%"
-                }
-            )
+            kpi_card(str(year), f"{round(val):,}", flex="1 1 15%")
             for year, val in zip(years, pop_forecast_values)
         ],
         style={
@@ -349,91 +698,25 @@ def update_dashboard(clickData):
         }
     )
 
-    # Combine all components into the final population section
-    pop_section = html.Div([
-        census_card,  # The census KPI card on top
-        dcc.Graph(figure=pop_forecast_fig),  # The population forecast line chart
-        population_kpi_cards  # The row of KPI cards for each forecast year
-    ])
-
     # --------------------------
     # Waste Composition Section (Section 2)
-    # Example: Compute current waste metrics
-    sw_gen = safe(row.get("Sum of SW_Generation (TPD)", 0))
-    sw_proc = safe(row.get("Sum of SW_Processed_ (TPD)", 0))
-    sw_gap = safe(row.get("Sum of SW Collection Gap (in TPD)", 0))
 
     # ----------------------------------------------------------------
-    # 1. Create bar chart (bar_fig) for current waste metrics
-    bar_fig = go.Figure()
-    bar_fig.add_trace(
-        go.Bar(
-            name=f"Generated: {sw_gen:.2f} TPD",
-            x=["Generated"],
-            y=[round(sw_gen, 2)],
-            marker_color="blue"
-        )
-    )
-    bar_fig.add_trace(
-        go.Bar(
-            name=f"Processed: {sw_proc:.2f} TPD",
-            x=["Processed"],
-            y=[round(sw_proc, 2)],
-            marker_color="green"
-        )
-    )
-    bar_fig.add_trace(
-        go.Bar(
-            name=f"Gap: {sw_gap:.2f} TPD",
-            x=["Gap"],
-            y=[round(sw_gap, 2)],
-            marker_color="red"
-        )
-    )
-    bar_fig.update_layout(
-        barmode="group",
-        title={"text": "Current Waste Metrics (TPD)", "x": 0.5},
-        plot_bgcolor="#1e1e1e",
-        paper_bgcolor="#1e1e1e",
-        font_color="white",
-        margin={"r": 0, "t": 40, "l": 0, "b": 0}
-    )
+    # 1. Bar chart values (name, height) for current waste metrics
+    bars = [
+        (f"Generated: {sw_gen:.2f} TPD", round(sw_gen, 2)),
+        (f"Processed: {sw_proc:.2f} TPD", round(sw_proc, 2)),
+        (f"Gap: {sw_gap:.2f} TPD", round(sw_gap, 2))
+    ]
 
     # ----------------------------------------------------------------
-    # 2. Create pie chart (pie_fig) for Processed vs Gap comparison
+    # 2. Pie chart values for Processed vs Gap comparison
     proc_pie = min(sw_proc, sw_gen)
     gap_pie = sw_gen - proc_pie
-    pie_fig = px.pie(
-        names=["Processed", "Gap"],
-        values=[proc_pie, gap_pie],
-        hole=0.3,
-        color_discrete_map={"Processed": "green", "Gap": "red"}
-    )
-    pie_fig.update_layout(
-        title={"text": "Processed vs Gap (TPD)", "x": 0.5},
-        plot_bgcolor="#1e1e1e",
-        paper_bgcolor="#1e1e1e",
-        font_color="white",
-        margin={"r": 0, "t": 40, "l": 0, "b": 0}
-    )
 
     # ----------------------------------------------------------------
     # 3. KPI Cards for % Waste Processed and Decadal Waste Growth Rate
-    waste_kpi_card_1 = html.Div(
-        [
-            html.H4("% Waste Processed", style={"fontSize": "16px", "fontWeight": "normal", "margin": "0"}),
-            html.P(f"{processed_percent:.1f}%", style={"fontSize": "24px", "fontWeight": "bold", "margin": "0"})
-        ],
-        style={
-            "padding": "15px",
-            "borderRadius": "10px",
-            "backgroundColor": "#2c2c2c",
-            "color": "white",
-            "textAlign": "center",
-            "margin": "5px",
-            "flex": "1 1 40%"
-        }
-    )
+    waste_kpi_card_1 = kpi_card("% Waste Processed", f"{processed_percent:.1f}%", flex="1 1 40%")
 
     waste_char_kpi_cards = html.Div(
         [waste_kpi_card_1],
@@ -441,140 +724,43 @@ def update_dashboard(clickData):
     )
 
     # ----------------------------------------------------------------
-    # 4. Place the charts side by side
-    charts_container = html.Div(
-        [
-            html.Div(dcc.Graph(figure=bar_fig), style={"flex": "1", "margin": "10px"}),
-            html.Div(dcc.Graph(figure=pie_fig), style={"flex": "1", "margin": "10px"})
-        ],
-        style={
-            "display": "flex",
-            "flexDirection": "row",
-            "justifyContent": "space-around",
-            "width": "100%"
-        }
-    )
-
-    # ----------------------------------------------------------------
-    # 5. Heading for Vehicle Requirement
+    # 4. Heading for Vehicle Requirement
     vehicle_heading = html.H4(
         "Vehicle Requirement to Process Generated Waste",
         style={"color": "white", "textAlign": "center", "marginTop": "20px"}
     )
 
     # ----------------------------------------------------------------
-    # 6. Build vehicle KPI cards (assume vehicle_cards is defined, for example:)
-
-    # --------------------------------------------------------
-    # VEHICLE OPTIMIZATION MODEL
-    # --------------------------------------------------------
-    # Set the daily waste gap as the required capacity (in tonnes)
-    W = sw_gen  # waste gap (tonnes)
-
-    # Vehicle capacities (in tonnes)
-    cap_bulk = 20  # Bulk truck capacity
-    cap_lcv = 3.8  # Mini LCV capacity
-    cap_tri = 0.5  # Tri-cycle trolley capacity
-
-    # Cost parameters (per day cost for each vehicle; ADD YOUR VALUES HERE)
-    cost_bulk = 2354 # e.g., cost per day for one bulk truck [ADD YOUR COST]
-    cost_lcv = 1926 # e.g., cost per day for one mini LCV truck [ADD YOUR COST]
-    cost_tri = 913  # e.g., cost per day for one tri-cycle trolley [ADD YOUR COST]
-
-    # Create MILP optimization model
-    problem = pl.LpProblem("Vehicle_Optimization", pl.LpMinimize)
-
-    # Decision variables (number of vehicles, integers)
-    x = pl.LpVariable('bulk_trucks', lowBound=0, cat='Integer')
-    y = pl.LpVariable('lcv_trucks', lowBound=0, cat='Integer')
-    z = pl.LpVariable('tricycle_trolleys', lowBound=0, cat='Integer')
-
-    # Objective: Minimize total daily cost of vehicles
-    problem += cost_bulk * x + cost_lcv * y + cost_tri * z, "Total_Daily_Cost"
-
-    # Constraint: The total capacity must cover the waste gap
-    problem += cap_bulk * x + cap_lcv * y + cap_tri * z >= W, "Capacity_Constraint"
-
-    # You can add additional constraints here (e.g., workforce, trip frequency, etc.)
-
-    # Solve the MILP optimization problem
-    problem.solve()
-
-    # Retrieve the optimal number of vehicles
-    bulk_opt = int(pl.value(x))
-    lcv_opt = int(pl.value(y))
-    tri_opt = int(pl.value(z))
+    # 5. Build vehicle KPI cards
+
+    # Vehicle counts are precomputed per district at startup (see solve_vehicles)
+    bulk_opt = r["bulk_opt"]
+    lcv_opt = r["lcv_opt"]
+    tri_opt = r["tri_opt"]
+    vehicles = [
+        ("New Bulk Trucks Required (20T)", bulk_opt),
+        ("New LCV Mini Trucks Required (3.8T)", lcv_opt),
+        ("New Tri-cycle Trolleys Required (0.5T)", tri_opt)
+    ]
     vehicle_cards = html.Div(
         [
-            html.Div(
-                [
-                    html.H4("New Bulk Trucks Required (20T)", style={"fontSize": "16px", "margin": "0"}),
-                    html.P(f"{int(bulk_opt):,}", style={"fontSize": "24px", "fontWeight": "bold", "margin": "0"})
-                ],
-                style={
-                    "padding": "10px",
-                    "border": "1px solid #444",
-                    "borderRadius": "10px",
-                    "flex": "1 1 30%",
-                    "backgroundColor": "#2c2c2c",
-                    "color": "white",
-                    "textAlign": "center",
-                    "margin": "5px"
-                }
-            ),
-            html.Div(
-                [
-                    html.H4("New LCV Mini Trucks Required (3.8T)", style={"fontSize": "16px", "margin": "0"}),
-                    html.P(f"{int(lcv_opt):,}", style={"fontSize": "24px", "fontWeight": "bold", "margin": "0"})
-                ],
-                style={
-                    "padding": "10px",
-                    "border": "1px solid #444",
-                    "borderRadius": "10px",
-                    "flex": "1 1 30%",
-                    "backgroundColor": "#2c2c2c",
-                    "color": "white",
-                    "textAlign": "center",
-                    "margin": "5px"
-                }
-            ),
-            html.Div(
-                [
-                    html.H4("New Tri-cycle Trolleys Required (0.5T)", style={"fontSize": "16px", "margin": "0"}),
-                    html.P(f"{int(tri_opt):,}", style={"fontSize": "24px", "fontWeight": "bold", "margin": "0"})
-                ],
-                style={
-                    "padding": "10px",
-                    "border": "1px solid #444",
-                    "borderRadius": "10px",
-                    "flex": "1 1 30%",
-                    "backgroundColor": "#2c2c2c",
-                    "color": "white",
-                    "textAlign": "center",
-                    "margin": "5px"
-                }
-            )
+            kpi_card(title, f"{int(count):,}", flex="1 1 30%", padding="10px", border="1px solid #444")
+            for title, count in vehicles
         ],
         style={"display": "flex", "justifyContent": "space-around", "width": "100%", "marginTop": "10px"}
     )
 
-    # ----------------------------------------------------------------
-    # 7. Combine the Waste Characteristics section
-    waste_char_section = html.Div(
-        [
-            waste_char_kpi_cards,  # KPI cards: % Waste Processed and Growth Rate
-            charts_container,  # Side-by-side bar and pie charts
-            vehicle_heading,  # Heading for Vehicle Requirement
-            vehicle_cards  # Vehicle KPI cards
-        ],
-        style={"marginTop": "20px"}
-    )
+    # The charts sit between the KPI cards and the vehicle content in the layout
+    vehicle_content = html.Div([
+        vehicle_heading,  # Heading for Vehicle Requirement
+        vehicle_cards  # Vehicle KPI cards
+    ])
 
     # ----------------------------------------------------------------
     # Waste Composition Section (Section 3)
-    pw = safe(row.get("Sum of Estimated PW Generation in TPD", 0))
-    cd = safe(row.get("Sum of C&D Waste Generation in TPD - 2025", 0))
-    ew = safe(row.get("Sum of e-waste Generation (TPA)", 0)) / 365
+    pw = r["pw"]
+    cd = r["cd"]
+    ew = r["ew_tpa"] / 365
 
     waste_kpis = [
         ("Total Solid Waste Generated", f"{sw_gen:.2f} TPD", "blue"),
@@ -585,25 +771,7 @@ def update_dashboard(clickData):
     ]
 
     waste_kpi_cards = html.Div(
-        [
-            html.Div(
-                [
-                    html.H4(title, style={"fontSize": "16px", "fontWeight": "normal"}),  # Smaller heading
-                    html.P(value, style={"fontSize": "24px", "fontWeight": "bold"})  # Larger value
-                ],
-
-                style={
-                    "padding": "15px",
-                    "borderRadius": "10px",
-                    "flex": "1 1 22%",
-                    "backgroundColor": color,
-                    "color": "white",
-                    "textAlign": "center",
-                    "margin": "5px"
-                }
-            )
-            for title, value, color in waste_kpis
-        ],
+        [kpi_card(title, value, bg=color) for title, value, color in waste_kpis],
         style={
             "display": "flex",
             "justifyContent": "space-around",
@@ -614,11 +782,42 @@ def update_dashboard(clickData):
 
     waste_comp_section = waste_kpi_cards
 
-    # Then make sure your callback returns all four sections like so:
-    return district_card, pop_section, waste_char_section, waste_comp_section
+    return {
+        "district_card": district_card,
+        "census_card": census_card,
+        "pop_forecast_y": pop_forecast_y,
+        "population_kpi_cards": population_kpi_cards,
+        "waste_char_kpi_cards": waste_char_kpi_cards,
+        "bars": bars,
+        "pie_values": [proc_pie, gap_pie],
+        "vehicle_content": vehicle_content,
+        "waste_comp_section": waste_comp_section
+    }
 
 # --- Callbacks to toggle each collapsible section ---
-@app.callback(
+# This is pure UI state, so it runs in the browser as a clientside callback and
+# never round-trips to the server.
+app.clientside_callback(
+    """
+    function(n_pop, n_waste_char, n_waste_comp, is_open_pop, is_open_waste_char, is_open_waste_comp) {
+        const ctx = window.dash_clientside.callback_context;
+
+        // If no button has been clicked, keep all sections closed.
+        if (!ctx.triggered.length) {
+            return [false, false, false];
+        }
+
+        // Get the ID of the button that triggered the callback
+        const button_id = ctx.triggered[0].prop_id.split(".")[0];
+
+        // Set only the section corresponding to the clicked button to open
+        return [
+            button_id === "toggle-pop",
+            button_id === "toggle-waste-char",
+            button_id === "toggle-waste-comp"
+        ];
+    }
+    """,
     [Output("collapse-pop", "is_open"),
      Output("collapse-waste-char", "is_open"),
      Output("collapse-waste-comp", "is_open")],
@@ -629,22 +828,6 @@ def update_dashboard(clickData):
      State("collapse-waste-char", "is_open"),
      State("collapse-waste-comp", "is_open")]
 )
-def toggle_sections(n_pop, n_waste_char, n_waste_comp, is_open_pop, is_open_waste_char, is_open_waste_comp):
-    ctx = dash.callback_context
-
-    # If no button has been clicked, keep all sections closed.
-    if not ctx.triggered:
-        return False, False, False
-
-    # Get the ID of the button that triggered the callback
-    button_id = ctx.triggered[0]["prop_id"].split(".")[0]
-
-    # Set only the section corresponding to the clicked button to open
-    return (
-        True if button_id == "toggle-pop" else False,
-        True if button_id == "toggle-waste-char" else False,
-        True if button_id == "toggle-waste-comp" else False,
-    )
 
 if __name__ == "__main__":
     app.run(debug=False, use_reloader=False)
\ No newline at end of file